@@ -8,102 +8,298 @@ import os
 import sys
 import math
 import json
+import logging
+import asyncio
+import glob
+import functools
+import importlib.util
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-from groq import Groq
+from typing import Optional, List, Dict, Any, Tuple, BinaryIO, TYPE_CHECKING
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 import subprocess
 
+# The groq SDK (and httpx, pydantic, anyio under it) is slow to import, so it
+# is only loaded once a client is actually needed
+if TYPE_CHECKING:
+    from groq import Groq, AsyncGroq
+
+logger = logging.getLogger("aisub")
+
+# A transcribed segment: (start seconds, end seconds, text)
+Segment = Tuple[float, float, str]
+
 # Configuration
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")  # Set your API key as environment variable
 MAX_FILE_SIZE_MB = 18  # Groq's limit
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
+GROQ_CONCURRENCY = int(os.getenv("GROQ_CONCURRENCY", "8"))  # Parallel chunk uploads
+AUDIO_BITRATE = 24000  # Bits per second of the extracted audio
+AUDIO_EXTENSION = ".ogg"  # Opus in an Ogg container, accepted by Groq
+MAX_COPY_BITRATE = 96000  # Source audio up to this bitrate is copied as-is
+# Source codecs that are stream-copied when mono and low bitrate,
+# mapped to the container extension each is written into
+COPYABLE_AUDIO_CODECS = {"aac": ".m4a", "mp3": ".mp3", "opus": ".ogg"}
+# Longest segment that stays under the size limit at the highest bitrate
+# we write (encoded or copied), with headroom
+MAX_SEGMENT_SECONDS = int(MAX_FILE_SIZE_BYTES * 8 / max(AUDIO_BITRATE, MAX_COPY_BITRATE) * 0.85)
+SEGMENT_SECONDS = min(600, MAX_SEGMENT_SECONDS)  # Length of each audio segment
+SEGMENT_POLL_INTERVAL = 0.5  # Seconds between checks for finished segments
+
+# Speech-friendly audio encoding used for every ffmpeg output
+AUDIO_ENCODE_ARGS = [
+    "-vn",  # Disable video
+    "-acodec", "libopus",  # Opus codec, ~2.5x smaller than MP3 for speech
+    "-ar", "16000",  # Sample rate 16kHz
+    "-ac", "1",  # Mono
+    "-b:a", f"{AUDIO_BITRATE // 1000}k",  # 24kbps bitrate
+    "-application", "voip",  # Tune the encoder for speech
+]
+
+# Keep ffmpeg's stderr down to actual errors
+FFMPEG_QUIET_ARGS = ["-hide_banner", "-loglevel", "error"]
+
+
+def http_client_options() -> Dict[str, Any]:
+    """
+    HTTP settings shared by every Groq client: enough pooled connections for
+    concurrent uploads, multiplexed over HTTP/2 when h2 is installed
+    """
+    import httpx
+    return {
+        "http2": importlib.util.find_spec("h2") is not None,
+        "limits": httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        "timeout": httpx.Timeout(300.0, connect=10.0),
+    }
+
+
+def create_groq_client(api_key: Optional[str]) -> "Groq":
+    """Create a Groq client using the shared HTTP settings"""
+    from groq import Groq, DefaultHttpxClient
+    # retry_on_rate_limit is the only retry layer; SDK retries would multiply it
+    return Groq(api_key=api_key, max_retries=0,
+                http_client=DefaultHttpxClient(**http_client_options()))
+
+
+def create_async_groq_client(api_key: Optional[str]) -> "AsyncGroq":
+    """Create an async Groq client using the shared HTTP settings"""
+    from groq import AsyncGroq, DefaultAsyncHttpxClient
+    return AsyncGroq(api_key=api_key, max_retries=0,
+                     http_client=DefaultAsyncHttpxClient(**http_client_options()))
+
+
+@functools.lru_cache(maxsize=None)
+def get_groq_client(api_key: Optional[str]) -> "Groq":
+    """Get the shared Groq client for api_key, creating it on first use"""
+    return create_groq_client(api_key)
+
+
+def setup_logging():
+    """Send progress messages to the console; AISUB_LOG sets the level"""
+    logging.basicConfig(
+        level=os.getenv("AISUB_LOG", "INFO").upper(),
+        format="%(asctime)s %(message)s",
+        datefmt="%H:%M:%S"
+    )
+
+
+def run_ffmpeg(cmd: List[str], capture_err: bool = True) -> subprocess.CompletedProcess:
+    """
+    Run an ffmpeg command, discarding stdout and keeping stderr only when
+    it is needed for error reporting
+    """
+    return subprocess.run(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE if capture_err else subprocess.DEVNULL,
+        check=True,
+        bufsize=1 << 20
+    )
 
-# Initialize Groq client
-client = Groq(
-    api_key=GROQ_API_KEY
-)
 
 def check_ffmpeg():
     """Check if ffmpeg is available"""
     try:
-        subprocess.run(["ffmpeg", "-version"], capture_output=True, check=True)
+        run_ffmpeg(["ffmpeg", "-version"], capture_err=False)
         return True
     except (subprocess.CalledProcessError, FileNotFoundError):
-        print("❌ ffmpeg not found. Please install ffmpeg first.")
-        print("   Ubuntu/Debian: sudo apt-get install ffmpeg")
-        print("   macOS: brew install ffmpeg")
-        print("   Windows: Download from https://ffmpeg.org/download.html")
+        logger.error("❌ ffmpeg not found. Please install ffmpeg first.")
+        logger.error("   Ubuntu/Debian: sudo apt-get install ffmpeg")
+        logger.error("   macOS: brew install ffmpeg")
+        logger.error("   Windows: Download from https://ffmpeg.org/download.html")
         return False
 
 
-def extract_audio(video_path: str, audio_path: str) -> bool:
+def segment_pattern(audio_path: str) -> str:
+    """
+    ffmpeg output pattern for the numbered segments of audio_path
+    """
+    path = Path(audio_path)
+    base = str(path.parent / path.stem).replace("%", "%%")
+    return f"{base}_part%03d{path.suffix}"
+
+
+def list_segments(audio_path: str) -> List[str]:
+    """
+    Find the segments written for audio_path, in order
+    Any extension matches, since copied audio keeps its own container
+    """
+    path = Path(audio_path)
+    return sorted(
+        str(p) for p in path.parent.glob(f"{glob.escape(path.stem)}_part[0-9][0-9][0-9].*")
+        if p.suffix != ".json"  # Saved transcriptions, not audio
+    )
+
+
+def segment_offsets(chunks: List[str]) -> List[float]:
+    """
+    Start time of each fixed-length segment within the original audio
+    """
+    return [i * SEGMENT_SECONDS for i in range(len(chunks))]
+
+
+def probe_audio_stream(video_path: str) -> Optional[Dict[str, Any]]:
     """
-    Extract audio from video using ffmpeg
+    Get codec details of the first audio stream, or None if unavailable
     """
-    print(f"🎬 Extracting audio from {video_path}...")
     try:
+        # Plain key=value lines for just the fields we need
         cmd = [
-            "ffmpeg",
-            "-i", video_path,
-            "-vn",  # Disable video
-            "-acodec", "libmp3lame",  # MP3 codec
-            "-ar", "16000",  # Sample rate 16kHz
-            "-ac", "1",  # Mono
-            "-b:a", "64k",  # 64kbps bitrate
-            "-y",  # Overwrite if exists
-            audio_path
+            "ffprobe",
+            "-v", "error",
+            "-select_streams", "a:0",
+            "-show_entries", "stream=codec_name,channels,bit_rate",
+            "-of", "default=noprint_wrappers=1",
+            video_path
         ]
+        result = subprocess.run(cmd, capture_output=True, check=True, text=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+    
+    stream = dict(line.split("=", 1) for line in result.stdout.splitlines() if "=" in line)
+    if not stream:
+        return None
+    channels = stream.get("channels", "")
+    stream["channels"] = int(channels) if channels.isdigit() else None
+    return stream
+
+
+def audio_output_format(video_path: str) -> Tuple[List[str], str]:
+    """
+    Choose how to write the audio: stream-copy sources that are already
+    speech-friendly, re-encode everything else
+    Returns the ffmpeg codec arguments and the output extension
+    """
+    stream = probe_audio_stream(video_path)
+    if stream:
+        ext = COPYABLE_AUDIO_CODECS.get(stream.get("codec_name"))
+        bit_rate = str(stream.get("bit_rate", ""))
+        if (ext and stream.get("channels") == 1 and bit_rate.isdigit()
+                and int(bit_rate) <= MAX_COPY_BITRATE):
+            logger.info(f"🎵 Source audio is {stream['codec_name']} mono at {int(bit_rate) // 1000}kbps, copying without re-encoding")
+            return ["-vn", "-c:a", "copy"], ext
+    return AUDIO_ENCODE_ARGS, AUDIO_EXTENSION
+
+
+def segment_audio_cmd(video_path: str, audio_path: str) -> Tuple[List[str], str]:
+    """
+    ffmpeg command that extracts audio straight into fixed-length segments,
+    each small enough to upload without further splitting
+    Returns the command and the output pattern of the segments
+    """
+    codec_args, ext = audio_output_format(video_path)
+    pattern = segment_pattern(str(Path(audio_path).with_suffix(ext)))
+    cmd = [
+        "ffmpeg",
+        *FFMPEG_QUIET_ARGS,
+        "-threads", "0",  # Use all available cores
+        "-i", video_path,
+        *codec_args,
+        "-f", "segment",
+        "-segment_time", str(SEGMENT_SECONDS),
+        "-reset_timestamps", "1",
+        "-y",  # Overwrite if exists
+        pattern
+    ]
+    return cmd, pattern
+
+
+def extract_audio(video_path: str, audio_path: str) -> bool:
+    """
+    Extract audio from video using ffmpeg, split into upload-sized segments
+    Use compress_audio_if_needed(audio_path) to collect the segments
+    """
+    logger.info(f"🎬 Extracting audio from {video_path}...")
+    # Segments left by a killed run would be mistaken for this run's output
+    for stale_path in list_segments(audio_path):
+        Path(stale_path).unlink(missing_ok=True)
+    try:
+        cmd, _ = segment_audio_cmd(video_path, audio_path)
+        run_ffmpeg(cmd)
         
-        subprocess.run(cmd, capture_output=True, check=True)
-        
-        if os.path.exists(audio_path):
-            size_mb = os.path.getsize(audio_path) / (1024 * 1024)
-            print(f"✅ Audio extracted: {audio_path} ({size_mb:.2f} MB)")
+        segments = list_segments(audio_path)
+        if segments:
+            size_mb = sum(os.path.getsize(p) for p in segments) / (1024 * 1024)
+            logger.info(f"✅ Audio extracted: {len(segments)} segment(s) ({size_mb:.2f} MB)")
             return True
         return False
         
     except subprocess.CalledProcessError as e:
-        print(f"❌ Failed to extract audio: {e.stderr.decode()}")
+        logger.error(f"❌ Failed to extract audio: {e.stderr.decode()}")
         return False
 
 
-def compress_audio_if_needed(audio_path: str) -> List[str]:
+def get_audio_duration(audio_path: str) -> float:
     """
-    Compress audio and split if needed to ensure each chunk < 18MB
-    Returns list of audio file paths
+    Get the duration of an audio file in seconds
     """
-    file_size = os.path.getsize(audio_path)
+    # Print the bare value so it parses with float() directly
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        audio_path
+    ]
+    result = subprocess.run(cmd, capture_output=True, check=True, text=True)
+    return float(result.stdout.strip())
+
+
+def split_audio(audio_path: str) -> Tuple[List[str], List[float]]:
+    """
+    Split audio if needed to ensure each chunk < 18MB
+    Returns list of audio file paths and the start offset of each one,
+    known from the split itself so callers never need to probe chunks
+    """
+    # Audio from extract_audio is already segmented to fit the limit
+    segments = list_segments(audio_path)
+    if segments:
+        return segments, segment_offsets(segments)
+    
+    file_size = os.stat(audio_path).st_size
     size_mb = file_size / (1024 * 1024)
     
-    print(f"📊 Audio file size: {size_mb:.2f} MB")
+    logger.info(f"📊 Audio file size: {size_mb:.2f} MB")
     
     if file_size <= MAX_FILE_SIZE_BYTES:
-        print("✅ File size is within limit, no compression needed")
-        return [audio_path]
+        logger.info("✅ File size is within limit, no compression needed")
+        return [audio_path], [0.0]
     
-    print(f"⚠️  File too large, splitting into chunks...")
+    logger.warning(f"⚠️  File too large, splitting into chunks...")
     
     # Get audio duration
     try:
-        cmd = [
-            "ffprobe",
-            "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "json",
-            audio_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, check=True, text=True)
-        duration = float(json.loads(result.stdout)["format"]["duration"])
+        duration = get_audio_duration(audio_path)
     except Exception as e:
-        print(f"❌ Could not get audio duration: {e}")
-        return []
+        logger.error(f"❌ Could not get audio duration: {e}")
+        return [], []
     
     # Calculate chunks
     num_chunks = math.ceil(file_size / MAX_FILE_SIZE_BYTES)
     chunk_duration = duration / num_chunks
-    print(f"⏱️  Audio duration: {duration:.2f}s, splitting into {num_chunks} chunks")
+    logger.info(f"⏱️  Audio duration: {duration:.2f}s, splitting into {num_chunks} chunks")
     
     chunks = []
+    offsets = []
     base_name = Path(audio_path).stem
     ext = Path(audio_path).suffix
     
@@ -111,112 +307,340 @@ def compress_audio_if_needed(audio_path: str) -> List[str]:
         start_time = i * chunk_duration
         chunk_path = f"{base_name}_part{i+1}{ext}"
         
-        print(f"🎵 Creating chunk {i+1}/{num_chunks}...")
+        logger.info(f"🎵 Creating chunk {i+1}/{num_chunks}...")
         
         try:
+            # Seek on the input side and stream-copy: the source is already
+            # encoded, so there is nothing to decode or re-encode
             cmd = [
                 "ffmpeg",
-                "-i", audio_path,
+                *FFMPEG_QUIET_ARGS,
                 "-ss", str(start_time),
+                "-i", audio_path,
                 "-t", str(chunk_duration),
                 "-vn",
-                "-acodec", "libmp3lame",
-                "-ar", "16000",
-                "-ac", "1",
-                "-b:a", "64k",
+                "-c:a", "copy",
                 "-y",
                 chunk_path
             ]
             
-            subprocess.run(cmd, capture_output=True, check=True)
+            run_ffmpeg(cmd)
+            
+            # One stat both confirms the chunk exists and gives its size
+            chunk_size_mb = os.stat(chunk_path).st_size / (1024 * 1024)
+            logger.info(f"   Chunk {i+1}: {chunk_size_mb:.2f} MB")
+            chunks.append(chunk_path)
+            offsets.append(start_time)
             
-            if os.path.exists(chunk_path):
-                chunk_size_mb = os.path.getsize(chunk_path) / (1024 * 1024)
-                print(f"   Chunk {i+1}: {chunk_size_mb:.2f} MB")
-                chunks.append(chunk_path)
-                
         except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to create chunk {i+1}: {e.stderr.decode()}")
+            logger.error(f"❌ Failed to create chunk {i+1}: {e.stderr.decode()}")
+            continue
+        except FileNotFoundError:
             continue
     
-    return chunks
+    return chunks, offsets
+
+
+def compress_audio_if_needed(audio_path: str) -> List[str]:
+    """
+    Compress audio and split if needed to ensure each chunk < 18MB
+    Returns list of audio file paths
+    """
+    return split_audio(audio_path)[0]
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Check whether error is Groq's rate limit (429) error"""
+    from groq import RateLimitError
+    return isinstance(error, RateLimitError)
+
+
+# Back off on rate limits (429) before giving up on a chunk
+retry_on_rate_limit = retry(
+    retry=retry_if_exception(is_rate_limit_error),
+    wait=wait_exponential(multiplier=1, max=30),
+    stop=stop_after_attempt(5),
+    reraise=True
+)
+
+
+def transcription_params(audio_path: str, file: BinaryIO, language: Optional[str]) -> Dict[str, Any]:
+    """
+    Build the keyword arguments for a transcription request
+    The open file handle is streamed from disk in small blocks by httpx;
+    passing a path or bytes instead would load the whole chunk into memory
+    """
+    return {
+        "file": (os.path.basename(audio_path), file),
+        "model": "whisper-large-v3-turbo",
+        "response_format": "verbose_json",
+        "timestamp_granularities": ["segment"],  # SRT only needs segment timings
+        "language": language,
+        "temperature": 0.0
+    }
+
+
+def transcription_to_dict(transcription) -> Dict[str, Any]:
+    """
+    Convert a Groq transcription response object to a dictionary
+    Segments are normalized once here into (start, end, text) tuples
+    """
+    segments = [
+        (float(segment.get("start", 0)), float(segment.get("end", 0)), segment.get("text", "").strip())
+        for segment in getattr(transcription, 'segments', None) or []
+    ]
+    return {
+        "text": transcription.text,
+        "segments": segments
+    }
+
+
+@retry_on_rate_limit
+def request_transcription(audio_path: str, language: Optional[str] = None):
+    """
+    Send a single transcription request
+    """
+    with open(audio_path, "rb") as file:
+        return get_groq_client(GROQ_API_KEY).audio.transcriptions.create(**transcription_params(audio_path, file, language))
+
+
+@retry_on_rate_limit
+async def request_transcription_async(async_client: "AsyncGroq", audio_path: str,
+                                      language: Optional[str] = None):
+    """
+    Send a single transcription request on the event loop
+    """
+    with open(audio_path, "rb") as file:
+        return await async_client.audio.transcriptions.create(**transcription_params(audio_path, file, language))
 
 
 def transcribe_with_groq(audio_path: str, language: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
     Transcribe audio file using Groq Whisper API via official library
     """
-    print(f"🤖 Transcribing {audio_path}...")
+    logger.info(f"🤖 Transcribing {audio_path}...")
     
     if not GROQ_API_KEY:
-        print("❌ GROQ_API_KEY environment variable not set")
+        logger.error("❌ GROQ_API_KEY environment variable not set")
         return None
     
     try:
-        with open(audio_path, "rb") as file:
-            transcription = client.audio.transcriptions.create(
-                file=(os.path.basename(audio_path), file),
-                model="whisper-large-v3-turbo",
-                response_format="verbose_json",
-                timestamp_granularities=["word", "segment"],
-                language=language,
-                temperature=0.0
-            )
-            
-            # Convert response object to dictionary
-            result = {
-                "text": transcription.text,
-                "segments": getattr(transcription, 'segments', []),
-                "words": getattr(transcription, 'words', [])
-            }
+        transcription = request_transcription(audio_path, language)
+        result = transcription_to_dict(transcription)
+        
+        logger.info(f"✅ Transcription complete!")
+        return result
+        
+    except Exception as e:
+        logger.error(f"❌ Transcription failed: {str(e)}")
+        return None
+
+
+async def transcribe_with_groq_async(async_client: "AsyncGroq", audio_path: str,
+                                     language: Optional[str], sem: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
+    """
+    Transcribe audio file using the async Groq client, bounded by a semaphore
+    """
+    async with sem:
+        logger.info(f"🤖 Transcribing {audio_path}...")
+        
+        try:
+            transcription = await request_transcription_async(async_client, audio_path, language)
+            result = transcription_to_dict(transcription)
             
-            print(f"✅ Transcription complete!")
+            logger.info(f"✅ Transcription complete: {audio_path}")
             return result
-                
-    except Exception as e:
-        print(f"❌ Transcription failed: {str(e)}")
+            
+        except Exception as e:
+            logger.error(f"❌ Transcription failed for {audio_path}: {str(e)}")
+            return None
+
+
+def checkpoint_path(chunk_path: str) -> str:
+    """
+    Sidecar file holding the saved transcription of chunk_path
+    """
+    return chunk_path + ".json"
+
+
+def checkpoint_key(video_path: str, language: Optional[str]) -> Dict[str, Any]:
+    """
+    Identify the run a saved transcription belongs to: the requested language
+    and the source video's size and modification time
+    """
+    stat = os.stat(video_path)
+    return {
+        "language": language,
+        "video_size": stat.st_size,
+        "video_mtime_ns": stat.st_mtime_ns
+    }
+
+
+def load_checkpoint(chunk_path: str, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Load a saved transcription for chunk_path, or None if there is none
+    or it was saved for a different language or version of the video
+    """
+    try:
+        with open(checkpoint_path(chunk_path), "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("key") != key:
+            return None
+        result = checkpoint["result"]
+        result["segments"] = [tuple(segment) for segment in result["segments"]]
+    except (FileNotFoundError, ValueError, KeyError, TypeError, AttributeError):
         return None
+    return result
+
+
+def save_checkpoint(chunk_path: str, key: Dict[str, Any], result: Dict[str, Any]):
+    """
+    Save a chunk's transcription so a re-run can skip uploading it again
+    """
+    with open(checkpoint_path(chunk_path), "w", encoding="utf-8") as f:
+        json.dump({"key": key, "result": result}, f)
+
+
+def remove_checkpoints(chunk_paths: List[str]):
+    """
+    Delete saved transcriptions once they are no longer needed
+    """
+    for chunk_path in chunk_paths:
+        Path(checkpoint_path(chunk_path)).unlink(missing_ok=True)
+
+
+async def transcribe_with_checkpoint(async_client: "AsyncGroq", audio_path: str,
+                                     language: Optional[str], sem: asyncio.Semaphore,
+                                     key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Transcribe a chunk unless a previous run with the same key already saved
+    its result, saving each new result as soon as it arrives
+    """
+    result = load_checkpoint(audio_path, key)
+    if result is not None:
+        logger.info(f"♻️  Reusing saved transcription for {audio_path}")
+        return result
+    
+    result = await transcribe_with_groq_async(async_client, audio_path, language, sem)
+    if result is not None:
+        save_checkpoint(audio_path, key, result)
+    return result
+
+
+async def transcribe_video_pipelined(video_path: str, audio_path: str,
+                                     language: Optional[str] = None) -> Tuple[List[str], Optional[List[Optional[Dict[str, Any]]]]]:
+    """
+    Extract audio into fixed-length segments with a single ffmpeg run and
+    transcribe each segment as soon as ffmpeg has finished writing it
+    Chunks transcribed by an earlier, interrupted run are not uploaded again
+    Returns segment paths and their results in order (None if extraction failed)
+    """
+    if not GROQ_API_KEY:
+        logger.error("❌ GROQ_API_KEY environment variable not set")
+        return [], None
+    
+    cmd, pattern = segment_audio_cmd(video_path, audio_path)
+    key = checkpoint_key(video_path, language)
+    
+    # Segments left by a killed run would look finished before ffmpeg starts
+    for stale_path in list_segments(audio_path):
+        Path(stale_path).unlink(missing_ok=True)
+    
+    logger.info(f"🎬 Extracting audio from {video_path}...")
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+    )
+    # Drain stderr so ffmpeg never blocks on a full pipe
+    stderr_task = asyncio.create_task(proc.stderr.read())
+    wait_task = asyncio.create_task(proc.wait())
+    
+    sem = asyncio.Semaphore(GROQ_CONCURRENCY)
+    chunks = []
+    tasks = []
+    
+    async with create_async_groq_client(GROQ_API_KEY) as async_client:
+        def submit_ready(finished: bool):
+            # A segment is complete once ffmpeg has opened the next one,
+            # or once ffmpeg has exited
+            while True:
+                index = len(chunks)
+                chunk_path = pattern % index
+                ready = os.path.exists(pattern % (index + 1)) or (finished and os.path.exists(chunk_path))
+                if not ready:
+                    return
+                logger.info(f"🎵 Segment {index + 1} ready")
+                chunks.append(chunk_path)
+                tasks.append(asyncio.create_task(
+                    transcribe_with_checkpoint(async_client, chunk_path, language, sem, key)
+                ))
+        
+        while not wait_task.done():
+            submit_ready(finished=False)
+            await asyncio.wait({wait_task}, timeout=SEGMENT_POLL_INTERVAL)
+        
+        stderr = await stderr_task
+        if wait_task.result() != 0:
+            logger.error(f"❌ Failed to extract audio: {stderr.decode(errors='replace')}")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return chunks, None
+        
+        submit_ready(finished=True)
+        logger.info(f"✅ Audio extracted into {len(chunks)} segment(s)")
+        results = await asyncio.gather(*tasks)
+    
+    return chunks, list(results)
 
 
 def format_timestamp(seconds: float) -> str:
     """
     Convert seconds to SRT timestamp format: HH:MM:SS,mmm
     """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millis = int((seconds % 1) * 1000)
+    # Work in integer milliseconds to avoid float modulo artifacts
+    millis = round(seconds * 1000)
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
 
-def generate_srt(segments: List[Dict[str, Any]], output_path: str) -> bool:
+def format_srt_entries(segments: List[Segment], first_index: int = 1) -> Tuple[str, int]:
+    """
+    Format segments as consecutive SRT entries numbered from first_index
+    Returns the SRT text and the index the next entry should use
+    """
+    entries = []
+    for start_time, end_time, text in segments:
+        if not text:
+            continue
+        
+        entries.append(
+            f"{first_index + len(entries)}\n"
+            f"{format_timestamp(start_time)} --> {format_timestamp(end_time)}\n"
+            f"{text}\n\n"
+        )
+    return "".join(entries), first_index + len(entries)
+
+
+def generate_srt(segments: List[Segment], output_path: str) -> bool:
     """
     Generate SRT subtitle file from transcription segments
     """
-    print(f"📝 Generating SRT file: {output_path}...")
+    logger.info(f"📝 Generating SRT file: {output_path}...")
     
     try:
+        # Build every SRT entry first, then write the file in one call
+        srt_text, _ = format_srt_entries(segments)
+        
         with open(output_path, "w", encoding="utf-8") as f:
-            subtitle_index = 1
-            for segment in segments:
-                start_time = segment.get("start", 0)
-                end_time = segment.get("end", 0)
-                text = segment.get("text", "").strip()
-                
-                if not text:
-                    continue
-                
-                # Write SRT entry
-                f.write(f"{subtitle_index}\n")
-                f.write(f"{format_timestamp(start_time)} --> {format_timestamp(end_time)}\n")
-                f.write(f"{text}\n\n")
-                subtitle_index += 1
+            f.write(srt_text)
         
-        print(f"✅ SRT file generated successfully")
+        logger.info(f"✅ SRT file generated successfully")
         return True
         
     except Exception as e:
-        print(f"❌ Failed to generate SRT: {str(e)}")
+        logger.error(f"❌ Failed to generate SRT: {str(e)}")
         return False
 
 
@@ -230,86 +654,67 @@ def process_video(video_path: str, srt_output_path: Optional[str] = None,
     
     video_path_obj = Path(video_path).resolve()
     if not video_path_obj.exists():
-        print(f"❌ Video file not found: {video_path_obj}")
+        logger.error(f"❌ Video file not found: {video_path_obj}")
         return False
     
     # Generate output paths
     if srt_output_path is None:
         srt_output_path = str(video_path_obj.with_suffix('.srt'))
     
-    audio_temp_path = str(video_path_obj.with_suffix('.tmp.mp3'))
+    audio_temp_path = str(video_path_obj.with_suffix('.tmp' + AUDIO_EXTENSION))
     
     try:
-        # Step 1: Extract audio
-        if not extract_audio(str(video_path), str(audio_temp_path)):
-            return False
+        # Steps 1-3: Extract audio segments, transcribing each one while
+        # ffmpeg is still encoding the rest
+        audio_chunks, results = asyncio.run(
+            transcribe_video_pipelined(str(video_path), audio_temp_path, language)
+        )
         
-        # Step 2: Compress/split audio
-        audio_chunks = compress_audio_if_needed(str(audio_temp_path))
-        if not audio_chunks:
+        if results is None or not audio_chunks:
             return False
         
-        # Step 3: Transcribe each chunk
-        all_segments = []
-        chunk_offsets = []
+        failed = sum(result is None for result in results)
+        if failed:
+            logger.warning(f"⚠️  {failed} of {len(results)} chunk(s) failed to transcribe, so the subtitles "
+                           f"are incomplete; re-run to retry only those chunks")
         
-        # Calculate offsets for each chunk
-        current_offset = 0
-        for chunk_path in audio_chunks:
-            # Get duration of this chunk
-            try:
-                cmd = [
-                    "ffprobe",
-                    "-v", "error",
-                    "-show_entries", "format=duration",
-                    "-of", "json",
-                    chunk_path
-                ]
-                result = subprocess.run(cmd, capture_output=True, check=True, text=True)
-                duration = float(json.loads(result.stdout)["format"]["duration"])
-            except:
-                duration = 0
-            
-            chunk_offsets.append(current_offset)
-            current_offset += duration
+        # Segments are cut at fixed intervals, so offsets need no probing
+        chunk_offsets = segment_offsets(audio_chunks)
         
-        # Transcribe chunks and apply offsets
-        for i, chunk_path in enumerate(audio_chunks):
-            result = transcribe_with_groq(chunk_path, language)
+        # Apply offsets in chunk order; each chunk's segments are already
+        # sorted and offsets only grow, so the result needs no sorting
+        all_segments = []
+        for i, result in enumerate(results):
             if result and result["segments"]:
                 offset = chunk_offsets[i]
-                for segment in result["segments"]:
-                    segment["start"] += offset
-                    segment["end"] += offset
-                    all_segments.append(segment)
-            
-            # Clean up chunk file
-            try:
-                Path(chunk_path).unlink()
-            except:
-                pass
+                for start, end, text in result["segments"]:
+                    all_segments.append((start + offset, end + offset, text))
         
         if not all_segments:
-            print("❌ No transcription segments found")
+            logger.error("❌ No transcription segments found")
             return False
         
-        # Sort segments by start time (in case of any overlap issues)
-        all_segments.sort(key=lambda x: x.get("start", 0))
-        
         # Step 4: Generate SRT
-        success = generate_srt(all_segments, str(srt_output_path))
+        if not generate_srt(all_segments, str(srt_output_path)):
+            return False
         
-        # Clean up temp audio file
-        try:
-            Path(audio_temp_path).unlink()
-        except:
-            pass
+        # Saved transcriptions are only kept while some chunk still needs a
+        # retry or the subtitles could not be written
+        if not failed:
+            remove_checkpoints(audio_chunks)
         
-        return success
+        # Subtitles missing a chunk are written, but the run did not succeed
+        return not failed
         
     except Exception as e:
-        print(f"❌ Processing failed: {str(e)}")
+        logger.error(f"❌ Processing failed: {str(e)}")
         return False
+    
+    finally:
+        # Clean up every segment ffmpeg wrote, including any that were never
+        # submitted because extraction failed part way
+        for chunk_path in list_segments(audio_temp_path):
+            Path(chunk_path).unlink(missing_ok=True)
 
 
 def main():
@@ -322,6 +727,8 @@ def main():
         print("  python video_to_subtitle.py video.mp4 subtitles.srt en")
         sys.exit(1)
     
+    setup_logging()
+    
     video_file = sys.argv[1]
     srt_file = sys.argv[2] if len(sys.argv) > 2 else None
     language = sys.argv[3] if len(sys.argv) > 3 else None
@@ -7,10 +7,10 @@ Fixed button color issue and added API key configuration
 
 import os
 import sys
+import asyncio
 import threading
 import math
-import json
-import configparser
+import tempfile
 import tkinter as tk
 from pathlib import Path
 from typing import Optional, List, Dict, Any
@@ -19,14 +19,15 @@ import subprocess
 try:
     import customtkinter as ctk
     from tkinter import filedialog, messagebox
-    from PIL import Image
 except ImportError as e:
     print(f"Missing dependencies: {e}")
-    print("Please install: pip install customtkinter pillow")
+    print("Please install: pip install customtkinter")
     sys.exit(1)
 
-# Import existing functionality
-import aisub
+try:
+    import uvloop  # Optional, faster event loop where available
+except ImportError:
+    uvloop = None
 
 # Configure CustomTkinter
 ctk.set_appearance_mode("dark")  # Options: "dark", "light", "system"
@@ -36,16 +37,43 @@ class ConfigManager:
     """Manage application configuration"""
     def __init__(self):
         self.config_file = Path("config.ini")
-        self.config = configparser.ConfigParser()
+        self.config: Dict[str, Dict[str, str]] = {}
         self.load_config()
     
     def load_config(self):
         """Load configuration from file"""
         if self.config_file.exists():
-            self.config.read(self.config_file)
+            self.config = self.parse_ini(self.config_file.read_text(encoding='utf-8'))
         else:
             self.create_default_config()
     
+    @staticmethod
+    def parse_ini(text: str) -> Dict[str, Dict[str, str]]:
+        """Parse the INI subset config.ini uses: [sections] of key = value lines"""
+        config = {}
+        section = None
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line[0] in ';#':
+                continue
+            if line[0] == '[' and line[-1] == ']':
+                section = config.setdefault(line[1:-1].strip(), {})
+                continue
+            if section is None:
+                continue
+            
+            key, _, value = line.partition('=')
+            section[key.strip().lower()] = value.strip()
+        return config
+    
+    @staticmethod
+    def format_ini(config: Dict[str, Dict[str, str]]) -> str:
+        """Format the config as INI text, the inverse of parse_ini"""
+        return "".join(
+            f"[{section}]\n" + "".join(f"{key} = {value}\n" for key, value in values.items()) + "\n"
+            for section, values in config.items()
+        )
+    
     def create_default_config(self):
         """Create default configuration file"""
         self.config['api'] = {
@@ -64,29 +92,47 @@ class ConfigManager:
         self.save_config()
     
     def save_config(self):
-        """Save configuration to file"""
-        with open(self.config_file, 'w') as f:
-            self.config.write(f)
+        """Save configuration to file, replacing it atomically"""
+        # Serialize in memory first so the file gets a single write
+        data = self.format_ini(self.config)
+        
+        config_dir = self.config_file.resolve().parent
+        fd, temp_path = tempfile.mkstemp(dir=config_dir, prefix='.config', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, self.config_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
     
     def get_api_key(self) -> str:
         """Get API key from config"""
-        return self.config.get('api', 'groq_api_key', fallback='')
+        return self.config.get('api', {}).get('groq_api_key', '')
     
     def set_api_key(self, api_key: str):
-        """Set API key in config"""
-        self.config.set('api', 'groq_api_key', api_key)
+        """Set API key in config, writing the file only if it changed"""
+        if self.get_api_key() == api_key:
+            return
+        
+        self.config.setdefault('api', {})['groq_api_key'] = api_key
         self.save_config()
     
     def get_default_language(self) -> str:
         """Get default language"""
-        return self.config.get('settings', 'default_language', fallback='auto')
+        return self.config.get('settings', {}).get('default_language', 'auto')
 
 class AutoSubtitleGUI:
+    _PROGRESS_INTERVAL_MS = 33  # Apply at most ~30 progress updates per second
+    _BUTTON_CHECK_DELAY_MS = 150  # Wait for typing in the file entry to pause
+    _VIDEO_EXTS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm', '.m4v'})
+    
     def __init__(self):
         self.root = ctk.CTk()
         self.config = ConfigManager()
         self.setup_window()
         self.setup_variables()
+        self.build_fonts()
         self.create_widgets()
         
     def setup_window(self):
@@ -105,11 +151,15 @@ class AutoSubtitleGUI:
         """Initialize variables"""
         self.selected_file = ctk.StringVar()
         self.output_file = ctk.StringVar()
-        self.language = ctk.StringVar(value=self.config.get_default_language())
         self.api_key = ctk.StringVar(value=self.config.get_api_key())
         self.progress_value = ctk.DoubleVar()
         self.status_text = ctk.StringVar(value="Ready")
         self.is_processing = False
+        self.loop = None
+        self._pending_progress = None
+        self._progress_scheduled = False
+        self._button_check_id = None
+        self._last_checked_file = None
         
         # Supported languages
         self.languages = {
@@ -126,6 +176,23 @@ class AutoSubtitleGUI:
             "Korean": "ko",
             "Arabic": "ar"
         }
+        self._language_keys = tuple(self.languages)
+        self._language_names = {code: name for name, code in self.languages.items()}
+        
+        # The config stores a language code; the menu shows its display name
+        default_language = self.config.get_default_language()
+        self.language = ctk.StringVar(value=self._language_names.get(default_language, default_language))
+    
+    def build_fonts(self):
+        """Create the fonts shared by all widgets, keyed by role"""
+        self._fonts = {
+            'header': ctk.CTkFont(size=32, weight="bold"),
+            'title': ctk.CTkFont(size=20, weight="bold"),
+            'button': ctk.CTkFont(size=16, weight="bold"),
+            'body': ctk.CTkFont(size=14),
+            'small': ctk.CTkFont(size=12),
+            'hint': ctk.CTkFont(size=10)
+        }
     
     def create_widgets(self):
         """Create and arrange GUI widgets"""
@@ -152,7 +219,7 @@ class AutoSubtitleGUI:
         title_label = ctk.CTkLabel(
             header_frame,
             text="🎬 AutoSubtitle",
-            font=ctk.CTkFont(size=32, weight="bold")
+            font=self._fonts['header']
         )
         title_label.grid(row=0, column=1, sticky="w", padx=(20, 10), pady=20)
         
@@ -167,7 +234,9 @@ class AutoSubtitleGUI:
     
     def create_main_content(self):
         """Create main content area"""
-        main_frame = ctk.CTkScrollableFrame(self.root)
+        # A plain frame: the content fits the window, and a scrollable frame
+        # would route every child through its canvas on each redraw
+        main_frame = ctk.CTkFrame(self.root)
         main_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=10)
         main_frame.grid_columnconfigure(1, weight=1)
         
@@ -193,7 +262,7 @@ class AutoSubtitleGUI:
         title_label = ctk.CTkLabel(
             file_frame,
             text="📁 Select Video File",
-            font=ctk.CTkFont(size=20, weight="bold")
+            font=self._fonts['title']
         )
         title_label.grid(row=0, column=0, columnspan=3, sticky="w", padx=20, pady=(20, 10))
         
@@ -207,7 +276,7 @@ class AutoSubtitleGUI:
             selection_frame,
             placeholder_text="Select a video file...",
             textvariable=self.selected_file,
-            font=ctk.CTkFont(size=14)
+            font=self._fonts['body']
         )
         self.file_entry.grid(row=0, column=0, columnspan=2, sticky="ew", padx=(0, 10))
         
@@ -224,7 +293,7 @@ class AutoSubtitleGUI:
         drop_label = ctk.CTkLabel(
             file_frame,
             text="💡 Tip: Click the text box to select a video file",
-            font=ctk.CTkFont(size=12),
+            font=self._fonts['small'],
             text_color="gray"
         )
         drop_label.grid(row=2, column=0, columnspan=3, padx=20, pady=(0, 20))
@@ -239,7 +308,7 @@ class AutoSubtitleGUI:
         title_label = ctk.CTkLabel(
             settings_frame,
             text="⚙️ Settings",
-            font=ctk.CTkFont(size=20, weight="bold")
+            font=self._fonts['title']
         )
         title_label.grid(row=0, column=0, columnspan=4, sticky="w", padx=20, pady=(20, 10))
         
@@ -255,7 +324,7 @@ class AutoSubtitleGUI:
             api_frame,
             placeholder_text="Enter your Groq API key or leave empty to use default",
             textvariable=self.api_key,
-            font=ctk.CTkFont(size=14),
+            font=self._fonts['body'],
             show="*"
         )
         self.api_entry.grid(row=0, column=0, sticky="ew", padx=(0, 10))
@@ -283,7 +352,7 @@ class AutoSubtitleGUI:
         api_help_label = ctk.CTkLabel(
             settings_frame,
             text="💡 Get your free API key from console.groq.com",
-            font=ctk.CTkFont(size=10),
+            font=self._fonts['hint'],
             text_color="gray"
         )
         api_help_label.grid(row=2, column=1, columnspan=2, sticky="w", pady=(0, 10))
@@ -294,9 +363,9 @@ class AutoSubtitleGUI:
         
         self.language_menu = ctk.CTkOptionMenu(
             settings_frame,
-            values=list(self.languages.keys()),
+            values=list(self._language_keys),
             variable=self.language,
-            font=ctk.CTkFont(size=14)
+            font=self._fonts['body']
         )
         self.language_menu.grid(row=3, column=1, sticky="w", pady=(0, 20))
         
@@ -312,7 +381,7 @@ class AutoSubtitleGUI:
             output_frame,
             placeholder_text="Leave empty to auto-generate...",
             textvariable=self.output_file,
-            font=ctk.CTkFont(size=14)
+            font=self._fonts['body']
         )
         self.output_entry.grid(row=0, column=0, sticky="ew", padx=(0, 10))
         
@@ -334,7 +403,7 @@ class AutoSubtitleGUI:
         title_label = ctk.CTkLabel(
             progress_frame,
             text="📊 Progress",
-            font=ctk.CTkFont(size=20, weight="bold")
+            font=self._fonts['title']
         )
         title_label.grid(row=0, column=0, columnspan=3, sticky="w", padx=20, pady=(20, 10))
         
@@ -350,7 +419,7 @@ class AutoSubtitleGUI:
         self.status_label = ctk.CTkLabel(
             progress_frame,
             textvariable=self.status_text,
-            font=ctk.CTkFont(size=14)
+            font=self._fonts['body']
         )
         self.status_label.grid(row=2, column=0, columnspan=3, padx=20, pady=(0, 20))
         
@@ -367,18 +436,21 @@ class AutoSubtitleGUI:
         self.action_button = ctk.CTkButton(
             action_frame,
             text="🎬 Start Processing",
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=self._fonts['button'],
             height=50,
             command=self.toggle_processing,
             state="disabled"
         )
         self.action_button.grid(row=0, column=1, padx=20, pady=20, sticky="ew")
         
+        # Theme color to restore after processing (None would break the button)
+        self._btn_default_fg = ctk.ThemeManager.theme["CTkButton"]["fg_color"]
+        
         # Open output folder button
         self.open_button = ctk.CTkButton(
             action_frame,
             text="📁 Open Output Folder",
-            font=ctk.CTkFont(size=14),
+            font=self._fonts['body'],
             height=40,
             command=self.open_output_folder,
             state="disabled"
@@ -396,7 +468,7 @@ class AutoSubtitleGUI:
         info_label = ctk.CTkLabel(
             footer_frame,
             text=info_text,
-            font=ctk.CTkFont(size=12),
+            font=self._fonts['small'],
             text_color="gray"
         )
         info_label.grid(row=0, column=1, sticky="ew", pady=15)
@@ -423,8 +495,9 @@ class AutoSubtitleGUI:
     
     def is_video_file(self, file_path: str) -> bool:
         """Check if file is a supported video format"""
-        video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm', '.m4v'}
-        return Path(file_path).suffix.lower() in video_extensions
+        if not file_path:
+            return False
+        return Path(file_path).suffix.lower() in self._VIDEO_EXTS
     
     def browse_file(self):
         """Browse for input video file"""
@@ -464,16 +537,38 @@ class AutoSubtitleGUI:
         if filename:
             self.output_file.set(filename)
     
+    def schedule_button_check(self, *args):
+        """Update the action button once the selected file stops changing"""
+        if self._button_check_id is not None:
+            self.root.after_cancel(self._button_check_id)
+        self._button_check_id = self.root.after(self._BUTTON_CHECK_DELAY_MS, self.update_action_button_state)
+    
     def update_action_button_state(self):
         """Update the state of the action button"""
-        has_file = bool(self.selected_file.get() and self.is_video_file(self.selected_file.get()))
+        self._button_check_id = None
+        file_path = self.selected_file.get()
+        if file_path == self._last_checked_file:
+            return
+        
+        self._last_checked_file = file_path
+        has_file = self.is_video_file(file_path)
         self.action_button.configure(state="normal" if has_file else "disabled")
     
     def toggle_theme(self):
         """Toggle between dark and light themes"""
-        current_mode = ctk.get_appearance_mode()
+        current_mode = ctk.get_appearance_mode().lower()
         new_mode = "light" if current_mode == "dark" else "dark"
+        
+        # Cover the window while every widget redraws, so the switch paints once
+        overlay = ctk.CTkFrame(self.root, corner_radius=0)
+        ctk.CTkLabel(overlay, text="Applying theme…", font=self._fonts['body']).place(relx=0.5, rely=0.5, anchor="center")
+        overlay.place(relx=0, rely=0, relwidth=1, relheight=1)
+        self.root.update_idletasks()
+        
         ctk.set_appearance_mode(new_mode)
+        self.root.update_idletasks()
+        overlay.place_forget()
+        overlay.destroy()
         
         # Update theme button text
         self.theme_button.configure(text="☀️" if new_mode == "dark" else "🌙")
@@ -496,41 +591,52 @@ class AutoSubtitleGUI:
         self.progress_bar.set(0)
         self.status_text.set("Starting...")
         
-        # Start processing in a separate thread
-        self.processing_thread = threading.Thread(target=self.process_video_thread, daemon=True)
-        self.processing_thread.start()
+        # Run processing on the background event loop
+        self.processing_future = asyncio.run_coroutine_threadsafe(
+            self.process_video(), self.get_event_loop()
+        )
     
     def stop_processing(self):
         """Stop the processing"""
         self.is_processing = False
-        # Fix: Use proper theme color instead of None
-        button_fg_color = ctk.ThemeManager.theme["CTkButton"]["fg_color"]
+        self._pending_progress = None
         self.action_button.configure(
             text="🎬 Start Processing", 
-            fg_color=button_fg_color
+            fg_color=self._btn_default_fg
         )
         self.progress_bar.set(0)
         self.status_text.set("Stopped")
     
     def update_processing_function(self):
         """Update the aisub processing function to use custom API key"""
-        # Set API key for this session
+        import aisub
+        
+        # Set API key for this session; aisub creates (and caches) a client per key
         if self.api_key.get():
-            # Create a modified version of the Groq client
-            client = aisub.Groq(api_key=self.api_key.get())
-            
-            # Monkey patch the client in aisub module
-            aisub.client = client
+            aisub.GROQ_API_KEY = self.api_key.get()
             print(f"Using custom API key: {self.api_key.get()[:10]}...")
         else:
             # Reset to default
-            client = aisub.Groq(api_key=aisub.GROQ_API_KEY)
-            aisub.client = client
+            aisub.GROQ_API_KEY = os.getenv("GROQ_API_KEY")
             print("Using default API key")
     
-    def process_video_thread(self):
-        """Process video in a separate thread"""
+    def get_event_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the event loop that runs processing, starting its thread on first use"""
+        if self.loop is None:
+            self.loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+            threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        return self.loop
+    
+    async def process_video(self):
+        """Process video on the background event loop"""
         try:
+            # aisub is imported on first use, keeping it off the startup path;
+            # a failed import must still reach processing_failed below
+            import aisub
+            
+            # Show aisub's progress messages on the console
+            aisub.setup_logging()
+            
             # Update API key before processing
             self.update_processing_function()
             
@@ -538,15 +644,9 @@ class AutoSubtitleGUI:
             output_file = self.output_file.get() if self.output_file.get() else None
             language_code = self.languages.get(self.language.get(), "auto")
             
-            # Update progress in GUI thread
-            def update_progress(step, total_steps, message):
-                progress = step / total_steps
-                self.root.after(0, lambda: self.progress_bar.set(progress))
-                self.root.after(0, lambda: self.status_text.set(message))
-            
             # Call the actual processing function with progress updates
-            success = self.run_processing_with_progress(
-                video_file, output_file, language_code, update_progress
+            success = await self.run_processing_with_progress(
+                video_file, output_file, language_code, self.update_progress
             )
             
             if success and self.is_processing:
@@ -558,106 +658,149 @@ class AutoSubtitleGUI:
             if self.is_processing:
                 self.root.after(0, self.processing_failed, str(e))
     
-    def run_processing_with_progress(self, video_file, output_file, language_code, update_progress):
+    def update_progress(self, step, total_steps, message):
+        """Queue a progress update; only the latest one is drawn, in the GUI thread"""
+        if not self.is_processing:
+            return
+        
+        self._pending_progress = (step / total_steps, message)
+        if not self._progress_scheduled:
+            self._progress_scheduled = True
+            self.root.after(self._PROGRESS_INTERVAL_MS, self.flush_progress)
+    
+    def flush_progress(self):
+        """Draw the latest queued progress update"""
+        self._progress_scheduled = False
+        pending = self._pending_progress
+        if pending is None:
+            return
+        
+        progress, message = pending
+        self.progress_bar.set(progress)
+        self.status_text.set(message)
+    
+    async def run_processing_with_progress(self, video_file, output_file, language_code, update_progress):
         """Run the actual processing with progress updates"""
+        import aisub
+        
         try:
             # Step 1: Check ffmpeg
             update_progress(1, 6, "🔍 Checking dependencies...")
-            if not aisub.check_ffmpeg():
+            if not await asyncio.to_thread(aisub.check_ffmpeg):
+                return False
+            
+            if not aisub.GROQ_API_KEY:
+                aisub.logger.error("❌ GROQ_API_KEY environment variable not set")
                 return False
             
             # Step 2: Extract audio
             update_progress(2, 6, "🎵 Extracting audio...")
             video_path = Path(video_file)
-            audio_temp_path = str(video_path.with_suffix('.tmp.mp3'))
+            audio_temp_path = str(video_path.with_suffix('.tmp' + aisub.AUDIO_EXTENSION))
             
-            if not aisub.extract_audio(video_file, audio_temp_path):
-                return False
-            
-            # Step 3: Compress audio
-            update_progress(3, 6, "📊 Compressing audio...")
-            audio_chunks = aisub.compress_audio_if_needed(audio_temp_path)
-            if not audio_chunks:
-                return False
-            
-            # Step 4: Transcribe
-            update_progress(4, 6, "🤖 Transcribing with AI...")
-            all_segments = []
-            chunk_offsets = []
-            
-            # Calculate offsets
-            current_offset = 0
-            for chunk_path in audio_chunks:
-                try:
-                    cmd = [
-                        "ffprobe", "-v", "error", "-show_entries", 
-                        "format=duration", "-of", "json", chunk_path
-                    ]
-                    result = subprocess.run(cmd, capture_output=True, check=True, text=True)
-                    duration = float(json.loads(result.stdout)["format"]["duration"])
-                except:
-                    duration = 0
+            try:
+                if not await asyncio.to_thread(aisub.extract_audio, video_file, audio_temp_path):
+                    return False
                 
-                chunk_offsets.append(current_offset)
-                current_offset += duration
-            
-            # Transcribe chunks
-            for i, chunk_path in enumerate(audio_chunks):
-                if not self.is_processing:
+                # Step 3: Compress audio
+                update_progress(3, 6, "📊 Compressing audio...")
+                # The split also gives each chunk's offset, so nothing is probed
+                audio_chunks, chunk_offsets = await asyncio.to_thread(aisub.split_audio, audio_temp_path)
+                if not audio_chunks:
                     return False
-                    
-                result = aisub.transcribe_with_groq(
-                    chunk_path, 
-                    language_code if language_code != "auto" else None
-                )
-                if result and result["segments"]:
-                    offset = chunk_offsets[i]
-                    for segment in result["segments"]:
-                        segment["start"] += offset
-                        segment["end"] += offset
-                        all_segments.append(segment)
                 
-                # Clean up chunk file
+                # Step 4: Transcribe
+                update_progress(4, 6, "🤖 Transcribing with AI...")
+                
+                # Generate final output path
+                if output_file is None:
+                    output_file = str(Path(video_file).with_suffix('.srt'))
+                
+                # Subtitles are written to a partial file while chunks finish,
+                # which replaces the output only once every chunk is in
+                partial_path = output_file + ".part"
+                replaced = False
                 try:
-                    Path(chunk_path).unlink()
-                except:
-                    pass
-            
-            # Step 5: Generate SRT
-            update_progress(5, 6, "📝 Generating SRT file...")
-            if not all_segments:
-                return False
-            
-            # Sort segments
-            all_segments.sort(key=lambda x: x.get("start", 0))
-            
-            # Generate final output path
-            if output_file is None:
-                output_file = str(Path(video_file).with_suffix('.srt'))
-            
-            success = aisub.generate_srt(all_segments, output_file)
-            
-            # Step 6: Cleanup
-            update_progress(6, 6, "🧹 Cleaning up...")
-            try:
-                Path(audio_temp_path).unlink()
-            except:
-                pass
+                    if not await self.transcribe_to_srt(audio_chunks, chunk_offsets, language_code, partial_path):
+                        return False
+                    
+                    # Step 5: Finish SRT
+                    update_progress(5, 6, "📝 Generating SRT file...")
+                    os.replace(partial_path, output_file)
+                    replaced = True
+                finally:
+                    if not replaced:
+                        Path(partial_path).unlink(missing_ok=True)
+                
+                # Step 6: Cleanup
+                update_progress(6, 6, "🧹 Cleaning up...")
+                return True
             
-            return success
+            finally:
+                # Remove every extracted segment, however processing ended
+                for chunk_path in aisub.list_segments(audio_temp_path):
+                    Path(chunk_path).unlink(missing_ok=True)
+                Path(audio_temp_path).unlink(missing_ok=True)
             
         except Exception as e:
             print(f"Processing error: {e}")
             return False
     
+    async def transcribe_to_srt(self, audio_chunks, chunk_offsets, language_code, srt_path) -> bool:
+        """
+        Transcribe chunks concurrently, writing their subtitles to srt_path in chunk order
+        as soon as every earlier chunk is done. Returns False if stopped, if any chunk
+        failed to transcribe or if nothing was written
+        """
+        import aisub
+        
+        language = language_code if language_code != "auto" else None
+        sem = asyncio.Semaphore(aisub.GROQ_CONCURRENCY)
+        finished = {}  # Chunks done ahead of an earlier one, by index
+        next_chunk = 0
+        next_entry = 1
+        
+        async def transcribe(i, chunk_path):
+            return i, await aisub.transcribe_with_groq_async(async_client, chunk_path, language, sem)
+        
+        async with aisub.create_async_groq_client(aisub.GROQ_API_KEY) as async_client:
+            with open(srt_path, "w", encoding="utf-8") as srt_file:
+                tasks = [asyncio.create_task(transcribe(i, chunk_path)) for i, chunk_path in enumerate(audio_chunks)]
+                for next_done in asyncio.as_completed(tasks):
+                    i, result = await next_done
+                    
+                    # The chunk was streamed from disk and its upload is over
+                    Path(audio_chunks[i]).unlink(missing_ok=True)
+                    
+                    # A failed chunk would leave a gap, so the rest are not worth uploading
+                    if not self.is_processing or result is None:
+                        for task in tasks:
+                            task.cancel()
+                        await asyncio.gather(*tasks, return_exceptions=True)
+                        return False
+                    
+                    offset = chunk_offsets[i]
+                    finished[i] = [
+                        (start + offset, end + offset, text)
+                        for start, end, text in result["segments"]
+                    ]
+                    
+                    # Write out the run of chunks that are now complete and in order
+                    while next_chunk in finished:
+                        srt_text, next_entry = aisub.format_srt_entries(finished.pop(next_chunk), next_entry)
+                        srt_file.write(srt_text)
+                        next_chunk += 1
+        
+        return next_entry > 1
+    
     def processing_completed(self):
         """Handle successful completion"""
         self.is_processing = False
-        # Fix: Use proper theme color instead of None
-        button_fg_color = ctk.ThemeManager.theme["CTkButton"]["fg_color"]
+        self._pending_progress = None
+        self.progress_bar.set(1)
         self.action_button.configure(
             text="🎬 Start Processing", 
-            fg_color=button_fg_color
+            fg_color=self._btn_default_fg
         )
         self.status_text.set("✅ Subtitles generated successfully!")
         self.open_button.configure(state="normal")
@@ -667,11 +810,10 @@ class AutoSubtitleGUI:
     def processing_failed(self, error_msg):
         """Handle processing failure"""
         self.is_processing = False
-        # Fix: Use proper theme color instead of None
-        button_fg_color = ctk.ThemeManager.theme["CTkButton"]["fg_color"]
+        self._pending_progress = None
         self.action_button.configure(
             text="🎬 Start Processing", 
-            fg_color=button_fg_color
+            fg_color=self._btn_default_fg
         )
         self.status_text.set(f"❌ Failed: {error_msg}")
         
@@ -701,7 +843,7 @@ class AutoSubtitleGUI:
     def run(self):
         """Start the GUI application"""
         # Bind file selection changes
-        self.selected_file.trace_add('write', lambda *args: self.update_action_button_state())
+        self.selected_file.trace_add('write', self.schedule_button_check)
         
         # Start the main loop
         self.root.mainloop()
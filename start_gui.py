@@ -7,20 +7,17 @@ Modern, user-friendly interface for converting videos to subtitles
 import os
 import sys
 import subprocess
+import importlib.util
 from pathlib import Path
 
 def check_dependencies():
     """Check if required dependencies are installed"""
-    required_packages = ['customtkinter', 'PIL', 'groq']
+    required_packages = ['customtkinter', 'groq', 'tenacity']
     missing_packages = []
     
+    # find_spec locates each package without executing it
     for package in required_packages:
-        try:
-            if package == 'PIL':
-                __import__('PIL')
-            else:
-                __import__(package)
-        except ImportError:
+        if importlib.util.find_spec(package) is None:
             missing_packages.append(package)
     
     if missing_packages:
@@ -30,8 +27,6 @@ def check_dependencies():
         print("\nInstalling missing packages...")
         
         for package in missing_packages:
-            if package == 'PIL':
-                package = 'Pillow'
             subprocess.check_call([sys.executable, '-m', 'pip', 'install', package])
         print("✅ Dependencies installed successfully!")
 